@@ -1,34 +1,100 @@
-from utils.config import log
+import asyncio
+import math
+
+from data_models.instruction_entries import AssignPhotoInstructionEntry
+from utils.config import log, settings as s
 from utils.csv_manager import CSVInstructionManager
-from utils.slack_connector import SlackConnectionManager
+from utils.slack_connector import SCIM_USERS_PAGE_SIZE, SlackConnectionManager
 
 
-async def update_user_photo_processor(
+async def _update_single_user_photo(
     slack_data_manager: SlackConnectionManager,
-    instructions: CSVInstructionManager,
+    csv_entry: AssignPhotoInstructionEntry,
+    email_to_id: dict[str, str],
+    semaphore: asyncio.Semaphore,
 ):
+    async with semaphore:
+        log.info("Working on %s", csv_entry.user_email)
 
-    for csv_entry in instructions.yield_assign_photo_instructions():
-        log.info(f"Working on {csv_entry.user_email}")
-        try:
-            user = await slack_data_manager.search_user(csv_entry.user_email)
-        except ValueError as e:
-            log.exception(f"Failed to search user '{csv_entry.user_email}': {e}")
-            continue
-        except Exception:
-            log.exception(f"Failed to search user '{csv_entry.user_email}'")
-            continue
+        user_id = email_to_id.get(csv_entry.user_email.lower())
+        if not user_id:
+            try:
+                user = await slack_data_manager.search_user(csv_entry.user_email)
+            except Exception:
+                log.exception("Failed to search user '%s'", csv_entry.user_email)
+                return
+
+            if not user:
+                log.error("User '%s' not found in Slack", csv_entry.user_email)
+                return
 
-        if not user:
-            log.error(f"User '{csv_entry.user_email}' not found in Slack")
-            continue
+            user_id = user["id"]
 
         try:
             await slack_data_manager.update_photo(
-                user_id=user["id"],
+                user_id=user_id,
                 photo_url=csv_entry.photo_url,
             )
-        except Exception as e:
-            log.exception(
-                f"Failed to update photo for user '{csv_entry.user_email}': {e}"
+        except Exception:
+            log.exception("Failed to update photo for user '%s'", csv_entry.user_email)
+
+
+async def _build_email_index_if_worth_it(
+    slack_data_manager: SlackConnectionManager,
+    total_rows: int,
+) -> dict[str, str]:
+    """
+    Builds the email -> Slack ID index only if paging through all SCIM users
+    takes fewer rate-limited calls than searching every CSV row one by one.
+    """
+    if total_rows <= 1:
+        return {}
+
+    try:
+        total_users = await slack_data_manager.count_scim_users()
+        index_pages = math.ceil(total_users / SCIM_USERS_PAGE_SIZE)
+        if index_pages >= total_rows:
+            log.info(
+                "Searching %s users one by one instead of paging %s SCIM pages",
+                total_rows,
+                index_pages,
             )
+            return {}
+
+        return await slack_data_manager.build_email_to_id_index()
+    except Exception:
+        log.exception("Failed to build email index, searching users one by one")
+        return {}
+
+
+async def update_user_photo_processor(
+    slack_data_manager: SlackConnectionManager,
+    instructions: CSVInstructionManager,
+):
+    # as in a sequential run, the last row for an email decides its photo
+    csv_entries: dict[str, AssignPhotoInstructionEntry] = {}
+    for csv_entry in instructions.yield_assign_photo_instructions():
+        key = csv_entry.user_email.lower()
+        if key in csv_entries:
+            log.info("Later row overrides photo for '%s'", csv_entry.user_email)
+            del csv_entries[key]
+        csv_entries[key] = csv_entry
+
+    email_to_id = await _build_email_index_if_worth_it(
+        slack_data_manager, len(csv_entries)
+    )
+
+    semaphore = asyncio.Semaphore(s.MAX_CONCURRENCY or 10)
+
+    # tasks are created in file order, so rows start in that order too
+    tasks = [
+        asyncio.create_task(
+            _update_single_user_photo(
+                slack_data_manager, csv_entry, email_to_id, semaphore
+            )
+        )
+        for csv_entry in csv_entries.values()
+    ]
+
+    for task in asyncio.as_completed(tasks):
+        await task
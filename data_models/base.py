@@ -1,5 +1,3 @@
-import hashlib
-
 from pydantic import BaseModel
 
 
@@ -12,12 +10,4 @@ class BaseSlackModel(BaseModel):
         raise NotImplementedError
 
     def __hash__(self):
-        bytes_obj = self.slack_id.encode("utf-8")
-
-        # Create an MD5 hash object
-        md5_hash = hashlib.md5(bytes_obj)
-
-        # Get the digest as an integer
-        digest_int = int.from_bytes(md5_hash.digest(), byteorder="big", signed=False)
-
-        return digest_int
+        return hash(self.slack_id)
@@ -1,7 +1,10 @@
 import re
+from functools import cached_property
 
 from data_models.base import BaseSlackModel
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 class Channel(BaseSlackModel):
     description: str | None = None
@@ -13,6 +16,10 @@ class Channel(BaseSlackModel):
     def of_type(self) -> str:
         return "channel"
 
-    @property
+    @cached_property
     def prepared_name(self):
-        return re.sub(r"\s+", "-", self.name.lower())
+        """
+        Slack-ready channel name, cached on first access: `name` must not
+        change after that (model_copy also copies the cached value)
+        """
+        return _WHITESPACE_RE.sub("-", self.name.lower())
@@ -1,9 +1,10 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 from data_models.workspace_role import WorkspaceRole
 
 
-class AddUserInstructionEntry(BaseModel):
+@dataclass(slots=True)
+class AddUserInstructionEntry:
     workspace_name: str
     workspace_slack_id: str
     channel_name: str
@@ -12,20 +13,26 @@ class AddUserInstructionEntry(BaseModel):
     user_slack_id: str
 
 
-class AssignAdminOwnerInstructionEntry(BaseModel):
+@dataclass(slots=True)
+class AssignAdminOwnerInstructionEntry:
     workspace_name: str
     workspace_slack_id: str
     user_email: str
     user_slack_id: str
     role: WorkspaceRole
 
+    def __post_init__(self):
+        self.role = WorkspaceRole(self.role)
 
-class DeactivateRemoveUserInstructionEntry(BaseModel):
+
+@dataclass(slots=True)
+class DeactivateRemoveUserInstructionEntry:
     user_email: str
     user_slack_id: str
 
 
-class InviteNewUserInstructionEntry(BaseModel):
+@dataclass(slots=True)
+class InviteNewUserInstructionEntry:
     workspace_name: str
     workspace_slack_id: str
     channel_name: str
@@ -37,15 +44,18 @@ class InviteNewUserInstructionEntry(BaseModel):
     location: str = None
 
 
-class ChangeUserEmailInstructionEntry(BaseModel):
+@dataclass(slots=True)
+class ChangeUserEmailInstructionEntry:
     current_email: str
     new_email: str
 
 
-class AbstractUserInstructionEntry(BaseModel):
+@dataclass(slots=True)
+class AbstractUserInstructionEntry:
     user_email: str
 
 
-class AssignPhotoInstructionEntry(BaseModel):
+@dataclass(slots=True)
+class AssignPhotoInstructionEntry:
     user_email: str
     photo_url: str
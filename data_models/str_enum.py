@@ -1,7 +1,4 @@
 from enum import Enum
-from typing import Iterator, Type, TypeVar
-
-T = TypeVar("T")
 
 
 class StrEnum(str, Enum):
@@ -10,8 +7,3 @@ class StrEnum(str, Enum):
 
     def __repr__(self):
         return f"{self.value!r}"
-
-    @classmethod
-    def __iter__(cls: Type[T]) -> Iterator[T]:
-        for i in cls:
-            yield cls(i)
@@ -0,0 +1,100 @@
+import json
+import unittest
+from unittest import mock
+
+import orjson
+import slack_sdk.scim.v1.response as scim_response
+import slack_sdk.web.base_client as web_base_client
+from slack_sdk import WebClient
+
+from utils.slack_connector import _OrjsonLoads
+
+# trimmed users.list response body as returned by Slack
+USERS_LIST_BODY = """{
+    "ok": true,
+    "members": [
+        {
+            "id": "U012AB3CD",
+            "team_id": "T012AB3C4",
+            "name": "spengler",
+            "deleted": false,
+            "real_name": "Egon Spengler",
+            "profile": {"display_name": "spengler", "title": "Ghostbuster é"},
+            "is_admin": true,
+            "updated": 1502138686
+        }
+    ],
+    "cache_ts": 1498777272,
+    "response_metadata": {"next_cursor": "dXNlcjpVMEc5V0ZYTlo="}
+}"""
+
+# trimmed SCIM GET /Users response body as returned by Slack
+SCIM_USERS_BODY = """{
+    "totalResults": 1,
+    "itemsPerPage": 1,
+    "startIndex": 1,
+    "schemas": ["urn:scim:schemas:core:1.0"],
+    "Resources": [
+        {
+            "schemas": ["urn:scim:schemas:core:1.0"],
+            "id": "W1234567890",
+            "userName": "other_username",
+            "active": true,
+            "emails": [{"value": "someone@example.com", "primary": true}],
+            "photos": [{"value": "https://photos.example.com/profilephoto.jpg"}]
+        }
+    ]
+}"""
+
+
+class OrjsonShimTest(unittest.TestCase):
+    def test_shim_is_installed(self):
+        self.assertIsInstance(web_base_client.json, _OrjsonLoads)
+        self.assertIsInstance(scim_response.json, _OrjsonLoads)
+
+    def test_users_list_response_is_decoded(self):
+        client = WebClient(token="xoxp-test")
+        client._perform_urllib_http_request = lambda **kwargs: {
+            "status": 200,
+            "headers": {},
+            "body": USERS_LIST_BODY,
+        }
+
+        with mock.patch.object(orjson, "loads", wraps=orjson.loads) as loads:
+            response = client.users_list(limit=150)
+
+        loads.assert_called_once_with(USERS_LIST_BODY)
+        self.assertEqual(response.data, json.loads(USERS_LIST_BODY))
+        self.assertEqual(
+            response.data["response_metadata"]["next_cursor"],
+            "dXNlcjpVMEc5V0ZYTlo=",
+        )
+
+    def test_scim_response_is_decoded(self):
+        with mock.patch.object(orjson, "loads", wraps=orjson.loads) as loads:
+            response = scim_response.SCIMResponse(
+                url="https://api.slack.com/scim/v1/Users",
+                status_code=200,
+                raw_body=SCIM_USERS_BODY,
+                headers={},
+            )
+
+        loads.assert_called_once_with(SCIM_USERS_BODY)
+        self.assertEqual(response.body, json.loads(SCIM_USERS_BODY))
+        self.assertEqual(response.body["Resources"][0]["id"], "W1234567890")
+
+    def test_invalid_body_raises_stdlib_decode_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            web_base_client.json.loads("not json")
+
+    def test_loads_kwargs_are_forwarded_to_stdlib(self):
+        decoded = web_base_client.json.loads('{"a": 1.5}', parse_float=str)
+
+        self.assertEqual(decoded, {"a": "1.5"})
+
+    def test_dumps_is_stdlib(self):
+        self.assertIs(web_base_client.json.dumps, json.dumps)
+
+
+if __name__ == "__main__":
+    unittest.main()
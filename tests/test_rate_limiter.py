@@ -0,0 +1,56 @@
+import asyncio
+import time
+import unittest
+
+from utils.rate_limiter import AsyncRateLimiter
+
+
+class AsyncRateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def _acquire_times(self, limiter: AsyncRateLimiter, calls: int):
+        times = []
+
+        async def call():
+            async with limiter:
+                times.append(time.monotonic())
+
+        await asyncio.gather(*(call() for _ in range(calls)))
+        return sorted(times)
+
+    async def test_first_burst_is_not_delayed(self):
+        limiter = AsyncRateLimiter("test", max_rate=5, time_period=0.5)
+
+        start = time.monotonic()
+        times = await self._acquire_times(limiter, 5)
+
+        self.assertLess(times[-1] - start, 0.05)
+
+    async def test_no_window_exceeds_max_rate(self):
+        max_rate, time_period = 5, 0.3
+        limiter = AsyncRateLimiter("test", max_rate=max_rate, time_period=time_period)
+
+        times = await self._acquire_times(limiter, 3 * max_rate + 1)
+
+        for i, window_start in enumerate(times):
+            in_window = [t for t in times[i:] if t < window_start + time_period]
+            self.assertLessEqual(len(in_window), max_rate)
+
+    async def test_calls_over_the_limit_wait_for_the_window(self):
+        limiter = AsyncRateLimiter("test", max_rate=2, time_period=0.2)
+
+        times = await self._acquire_times(limiter, 3)
+
+        self.assertGreaterEqual(times[2] - times[0], 0.2)
+
+    async def test_calls_are_not_delayed_after_the_window(self):
+        limiter = AsyncRateLimiter("test", max_rate=2, time_period=0.1)
+        await self._acquire_times(limiter, 2)
+        await asyncio.sleep(0.1)
+
+        start = time.monotonic()
+        times = await self._acquire_times(limiter, 2)
+
+        self.assertLess(times[-1] - start, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import atexit
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 
 from dynaconf import Dynaconf
 
@@ -27,12 +29,16 @@ log_formatter = logging.Formatter(
     "[%(asctime)s][%(levelname)s] %(filename)s:%(lineno)d | %(message)s"
 )
 
+# handlers doing actual I/O are run by a background listener thread,
+# the root logger only puts records on a queue
+log_handlers = []
+
 if settings.LOG_TO_CONSOLE:
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(log_formatter)
 
-    root.addHandler(console_handler)
+    log_handlers.append(console_handler)
 
 
 if settings.LOG_TO_FILE:
@@ -49,4 +55,13 @@ if settings.LOG_TO_FILE:
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(log_formatter)
 
-    root.addHandler(file_handler)
+    log_handlers.append(file_handler)
+
+
+if log_handlers:
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    root.addHandler(QueueHandler(log_queue))
@@ -1,5 +1,6 @@
 import csv
 from contextlib import contextmanager
+from dataclasses import MISSING, fields
 from typing import ContextManager, Generator
 
 from data_models.instruction_entries import (
@@ -11,18 +12,44 @@ from data_models.instruction_entries import (
     AbstractUserInstructionEntry,
     AssignPhotoInstructionEntry,
 )
+from .config import log
+
+_ADD_USER_FIELDS = tuple(f.name for f in fields(AddUserInstructionEntry))
 
 
 class CSVInstructionManager:
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, eager: bool = False):
+        """
+        :param filename: Path to the instructions CSV file
+        :param eager: Keep parsed rows in memory after the first read, so
+            later passes over the file do not read and decode it again
+        """
         self.filename = filename
+        self.eager = eager
 
         self._current_file = None
-        self._csv_dict_writer = None
+        self._csv_writer = None
+
+        self._total_instructions: int | None = None
+        self._cached_rows: list[tuple[int, list[str]]] | None = None
+
+    @property
+    def total_instructions(self) -> int:
+        """
+        Number of instruction entries in the file, counted on first access
+        """
+        if self._total_instructions is None:
+            with open(self.filename, "rb") as file:
+                # header line is not an instruction, empty files have none
+                self._total_instructions = max(sum(1 for _ in file) - 1, 0)
+        return self._total_instructions
+
+    def __len__(self) -> int:
+        return self.total_instructions
 
-        with open(self.filename, "r") as file:
-            self.total_instructions = sum(1 for _ in file)
-            self.total_instructions -= 1
+    def __bool__(self) -> bool:
+        # truthiness must not fall back to __len__ and read the whole file
+        return True
 
     @contextmanager
     def open_for_writing(
@@ -30,21 +57,36 @@ class CSVInstructionManager:
     ) -> ContextManager:
         with open(self.filename, "w") as file:
             self._current_file = file
-            self._csv_dict_writer = csv.DictWriter(
-                file, fieldnames=AddUserInstructionEntry.model_fields.keys()
-            )
-            self._csv_dict_writer.writeheader()
+            self._csv_writer = csv.writer(file)
+            self._csv_writer.writerow(_ADD_USER_FIELDS)
             yield file
         self._current_file = None
-        self._csv_dict_writer = None
+        self._csv_writer = None
+        self._total_instructions = None
+        self._cached_rows = None
 
     def add_entry(self, entry: AddUserInstructionEntry):
-        if not isinstance(entry, AddUserInstructionEntry):
-            raise ValueError(f"Expected InstructionEntry, got {type(entry)}")
         if not self._current_file:
             raise ValueError("No file opened")
 
-        self._csv_dict_writer.writerow(entry.model_dump())
+        self._csv_writer.writerow([getattr(entry, f) for f in _ADD_USER_FIELDS])
+
+    def _read_rows(self) -> Generator[tuple[int, list[str]], None, None]:
+        """
+        Reads raw CSV rows, header included, from the file or the cache
+
+        :return: A generator of (line number, row) pairs
+        """
+        if self._cached_rows is None:
+            with open(self.filename, "r") as file:
+                reader = csv.reader(file)
+                rows = ((reader.line_num, row) for row in reader)
+                if not self.eager:
+                    yield from rows
+                    return
+                self._cached_rows = list(rows)
+
+        yield from self._cached_rows
 
     def _read_entries(
         self,
@@ -56,10 +98,42 @@ class CSVInstructionManager:
         :param instructions_type: The type of InstructionEntry to create
         :return: A generator of InstructionEntry objects
         """
-        with open(self.filename, "r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                yield instructions_type(**row)
+        rows = self._read_rows()
+        _, header = next(rows, (0, None))
+        if not header:
+            # an empty file holds no instructions
+            return
+
+        # (column index, default) per entry field, the default is used
+        # only for optional fields whose column is missing from the file
+        columns = []
+        for field in fields(instructions_type):
+            if field.name in header:
+                columns.append((header.index(field.name), None))
+            elif field.default is not MISSING:
+                columns.append((None, field.default))
+            else:
+                raise ValueError(
+                    f"Column '{field.name}' is missing in '{self.filename}'"
+                )
+
+        row_length = max((i for i, _ in columns if i is not None), default=-1) + 1
+
+        for line_num, row in rows:
+            if not row:
+                continue
+            if len(row) < row_length:
+                log.error(
+                    "Skipping line %s of '%s': expected at least %s columns, got %s",
+                    line_num,
+                    self.filename,
+                    row_length,
+                    len(row),
+                )
+                continue
+            yield instructions_type(
+                *(default if i is None else row[i] for i, default in columns)
+            )
 
     def yield_add_to_channel_instructions(
         self,
@@ -0,0 +1,57 @@
+import asyncio
+import time
+from collections import deque
+
+from .config import log, settings as s
+
+
+class AsyncRateLimiter:
+    """
+    Sliding window rate limiter shared by concurrent coroutines.
+
+    At most `max_rate` calls are let through in any `time_period` seconds
+    window, and waiting coroutines are released one by one in the order
+    they arrived.
+    """
+
+    def __init__(self, name: str, max_rate: int, time_period: float = 60):
+        self.name = name
+        self.max_rate = max_rate
+        self.time_period = time_period
+
+        # monotonic times of the last `max_rate` calls let through
+        self._calls: deque[float] = deque(maxlen=max_rate)
+        self._lock = asyncio.Lock()
+
+    def _wait_time(self, now: float) -> float:
+        if len(self._calls) < self.max_rate:
+            return 0.0
+        return self._calls[0] + self.time_period - now
+
+    async def acquire(self) -> None:
+        # nobody is waiting and the window has room: take a slot right away,
+        # there is no await in between so no other coroutine can interleave
+        if not self._lock.locked():
+            now = time.monotonic()
+            if self._wait_time(now) <= 0:
+                self._calls.append(now)
+                return
+
+        async with self._lock:
+            now = time.monotonic()
+            sleep_time = self._wait_time(now)
+            while sleep_time > 0:
+                if s.LOG_DEBOUNCING:
+                    log.info(
+                        f"Sleeping for {sleep_time} seconds to avoid rate limit for '{self.name}'"
+                    )
+                await asyncio.sleep(sleep_time)
+                now = time.monotonic()
+                sleep_time = self._wait_time(now)
+            self._calls.append(now)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
@@ -1,8 +1,11 @@
 import asyncio
+import json
 import re
-from datetime import datetime, UTC
 from typing import Type
 
+import orjson
+import slack_sdk.scim.v1.response as _scim_response
+import slack_sdk.web.base_client as _web_base_client
 from slack_sdk import WebClient
 from slack_sdk.http_retry import RateLimitErrorRetryHandler
 from slack_sdk.scim import SCIMClient, User as ScimUser
@@ -11,7 +14,37 @@ from slack_sdk.scim.v1.user import UserEmail
 from data_models.channel import Channel
 from data_models.user import User
 from data_models.workspace import Workspace
-from .config import log, settings as s
+from .config import log
+from .rate_limiter import AsyncRateLimiter
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_SEARCH_USER_CACHE_SIZE = 10000
+
+# largest page Slack SCIM returns for a single search_users call
+SCIM_USERS_PAGE_SIZE = 1000
+
+
+class _OrjsonLoads:
+    """
+    Stands in for the `json` module inside slack_sdk: responses are decoded
+    with orjson, everything else (dumps, JSONDecodeError, ...) is stdlib json
+    """
+
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+    @staticmethod
+    def loads(s, **kwargs):
+        # orjson takes no options, keep stdlib behaviour for callers using them
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+# orjson speeds up decoding of large users_list / SCIM pages
+_web_base_client.json = _OrjsonLoads()
+_scim_response.json = _OrjsonLoads()
 
 
 class BadUsernameError(ValueError):
@@ -46,7 +79,8 @@ class SlackConnectionManager:
             token=token,
             retry_handlers=[rate_limit_handler],
         )
-        self._debounce_data = {}
+        self._limiters: dict[str, AsyncRateLimiter] = {}
+        self._search_user_cache: dict[str, asyncio.Task] = {}
 
     async def _log_creation(
         self,
@@ -66,23 +100,26 @@ class SlackConnectionManager:
             function_name: name of the function to debounce
             rate_limit_per_minute: rate limit in calls per minute
         """
-        if function_name not in self._debounce_data:
-            self._debounce_data[function_name] = datetime.now(UTC)
-            return
+        limiter = self._limiters.get(function_name)
+        if limiter is None:
+            limiter = AsyncRateLimiter(function_name, rate_limit_per_minute)
+            self._limiters[function_name] = limiter
 
-        current_time = datetime.now(UTC)
-        time_since_last_call = current_time - self._debounce_data[function_name]
-        if time_since_last_call.total_seconds() < 60 / rate_limit_per_minute:
-            sleep_time = (
-                (60 / rate_limit_per_minute) - time_since_last_call.total_seconds() + 1
-            )
-            if s.LOG_DEBOUNCING:
-                log.info(
-                    f"Sleeping for {sleep_time} seconds to avoid rate limit for '{function_name}'"
-                )
-            await asyncio.sleep(sleep_time)
+        async with limiter:
+            pass
 
-        self._debounce_data[function_name] = current_time
+    def _forget_searched_user(self, user_email: str | None = None) -> None:
+        """
+        Drops cached search_user results after a change to a user in Slack.
+
+        Args:
+            user_email: email of the changed user, the whole cache is
+                dropped if it is not known
+        """
+        if user_email is None:
+            self._search_user_cache.clear()
+        else:
+            self._search_user_cache.pop(user_email.lower(), None)
 
     @staticmethod
     def fill_scim_user(
@@ -122,7 +159,9 @@ class SlackConnectionManager:
 
     async def _create_slack_user(self, scim_user: ScimUser) -> str:
         await self._debounce("create_user", 20)
-        response = self._scim_client.create_user(user=scim_user)
+        response = await asyncio.to_thread(
+            self._scim_client.create_user, user=scim_user
+        )
         if response.status_code == 201:
             user_id = response.body["id"]
             # log.info(f"User {user.email} created successfully. Slack ID: {user_id}")
@@ -180,6 +219,8 @@ class SlackConnectionManager:
             log.exception(f"Failed to create user {user.email}: {e}")
             raise e
 
+        self._forget_searched_user(user.email)
+
         log.info(f"User {user.email} created successfully. Slack ID: {created_user_id}")
         return created_user_id
 
@@ -198,14 +239,46 @@ class SlackConnectionManager:
         return user_data["id"]
 
     async def search_user(self, user_email: str) -> dict | None:
+        """
+        Finds a SCIM user by email.
+
+        Results are cached per email, and concurrent lookups of the same
+        email share a single request. Failed lookups are not cached.
+
+        Args:
+            user_email: The email of the user to find.
+
+        Returns:
+            The SCIM user resource, or None if there is no such user.
+
+        Raises:
+            ValueError: If the SCIM search request fails.
+            MultipleUsersWithSameEmailError: If several users have this email.
+        """
+        key = user_email.lower()
+        task = self._search_user_cache.get(key)
+        if task is None:
+            if len(self._search_user_cache) >= _SEARCH_USER_CACHE_SIZE:
+                self._search_user_cache.pop(next(iter(self._search_user_cache)))
+            task = asyncio.ensure_future(self._search_user(user_email))
+            self._search_user_cache[key] = task
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._search_user_cache.get(key) is task:
+                del self._search_user_cache[key]
+            raise
+
+    async def _search_user(self, user_email: str) -> dict | None:
         await self._debounce("scim_search_users", 20)
         filter_query = f"email eq {user_email}"
 
-        response = self._scim_client.search_users(
-            count=10, start_index=0, filter=filter_query
+        response = await asyncio.to_thread(
+            self._scim_client.search_users, count=10, start_index=0, filter=filter_query
         )
         if response.status_code != 200:
-            raise ("Failed to search users in Slack")
+            raise ValueError(f"Failed to search users in Slack: {response.status_code}")
 
         existing_users = response.body.get("Resources")
 
@@ -217,8 +290,74 @@ class SlackConnectionManager:
                 f"Multiple users found with email {user_email}"
             )
 
-        user = existing_users[0]
-        return user
+        return existing_users[0]
+
+    async def count_scim_users(self) -> int:
+        """
+        Number of SCIM users in the organization, read with a single request.
+
+        Raises:
+            ValueError: If the SCIM search request fails
+        """
+        await self._debounce("scim_search_users", 20)
+        response = await asyncio.to_thread(
+            self._scim_client.search_users, count=1, start_index=1
+        )
+        if response.status_code != 200:
+            raise ValueError(f"Failed to search users in Slack: {response.status_code}")
+
+        return response.body["totalResults"]
+
+    async def build_email_to_id_index(
+        self, page_size: int = SCIM_USERS_PAGE_SIZE
+    ) -> dict[str, str]:
+        """
+        Fetches all SCIM users page by page and maps their emails to Slack IDs.
+
+        Emails shared by several users are left out of the index, so looking
+        them up with search_user still raises MultipleUsersWithSameEmailError.
+
+        Args:
+            page_size: number of users requested per SCIM call (1000 at most)
+
+        Returns:
+            A dict of lowercased email -> Slack user ID
+
+        Raises:
+            ValueError: If a SCIM search request fails
+        """
+        email_to_id = {}
+        ambiguous_emails = set()
+        start_index = 1
+
+        while True:
+            await self._debounce("scim_search_users", 20)
+            response = await asyncio.to_thread(
+                self._scim_client.search_users,
+                count=page_size,
+                start_index=start_index,
+            )
+            if response.status_code != 200:
+                raise ValueError(
+                    f"Failed to search users in Slack: {response.status_code}"
+                )
+
+            resources = response.body.get("Resources") or []
+            for resource in resources:
+                for email in resource.get("emails") or []:
+                    key = email["value"].lower()
+                    if key in email_to_id and email_to_id[key] != resource["id"]:
+                        ambiguous_emails.add(key)
+                    email_to_id[key] = resource["id"]
+
+            if len(resources) < page_size:
+                break
+            start_index += page_size
+
+        for key in ambiguous_emails:
+            del email_to_id[key]
+
+        return email_to_id
 
     async def deactivate_user(self, user: User):
         """
@@ -232,7 +371,10 @@ class SlackConnectionManager:
             Exception: If the user could not be deactivated.
         """
         await self._debounce("admin_users_delete", 90)
-        self._scim_client.patch_user(user.slack_id, {"active": False})
+        await asyncio.to_thread(
+            self._scim_client.patch_user, user.slack_id, {"active": False}
+        )
+        self._forget_searched_user(user.email)
 
     async def verify_workspace_exists_in_slack(
         self, workspace: Workspace
@@ -250,7 +392,7 @@ class SlackConnectionManager:
             Exception: If the API call to list teams fails.
         """
         await self._debounce("admin_teams_list", 50)
-        response = self._slack_user_client.admin_teams_list()
+        response = await asyncio.to_thread(self._slack_user_client.admin_teams_list)
 
         if not response.data["ok"]:
             raise Exception("Failed to list teams in Slack")
@@ -286,7 +428,7 @@ class SlackConnectionManager:
 
         # domains should be unique for slack platform
         # adding company abbreviation is a good way to achieve that
-        domain = re.sub(r"\s+", "-", domain) + "-misr"
+        domain = _WHITESPACE_RE.sub("-", domain) + "-misr"
 
         # domain should be shorter that 21 characters
         # 'training-abcdefghijkl.slack.com' is the longest possible domain
@@ -295,7 +437,8 @@ class SlackConnectionManager:
             raise ValueError(
                 f"Domain name '{domain}' is too long ({len(domain)} characters)"
             )
-        response = self._slack_user_client.admin_teams_create(
+        response = await asyncio.to_thread(
+            self._slack_user_client.admin_teams_create,
             team_name=workspace.name,
             team_domain=domain,
         )
@@ -328,7 +471,8 @@ class SlackConnectionManager:
         await self._debounce("conversations_create", 20)
 
         # using basic method (not admin) requires joining the workspace first
-        created_channel = self._slack_user_client.conversations_create(
+        created_channel = await asyncio.to_thread(
+            self._slack_user_client.conversations_create,
             name=channel.prepared_name,
             description=channel.description,
             team_id=workspace.slack_id,
@@ -357,7 +501,8 @@ class SlackConnectionManager:
             Exception: If the channel could not be linked to additional workspaces.
         """
         await self._debounce("set_teams", 20)
-        self._slack_user_client.admin_conversations_setTeams(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_conversations_setTeams,
             channel_id=channel.slack_id,
             target_team_ids=[w.slack_id for w in additional_workspaces],
             team_id=main_workspace.slack_id,
@@ -379,7 +524,8 @@ class SlackConnectionManager:
             Exception: If the user could not be added to the workspace.
         """
         await self._debounce("admin_users_assign", 20)
-        self._slack_user_client.admin_users_assign(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_users_assign,
             team_id=workspace_id,
             user_id=user_id,
             channel_ids=channel_slack_ids,
@@ -399,20 +545,18 @@ class SlackConnectionManager:
             Exception: If the user could not be invited to the workspace.
         """
         await self._debounce("admin_conversations_invite", 20)
-        self._slack_user_client.admin_conversations_invite(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_conversations_invite,
             user_ids=user_id,
             channel_id=channel_slack_id,
         )
 
-    async def get_users_of_workspace(
-        self, workspace: Workspace, next_cursor: str = None
-    ):
+    async def get_users_of_workspace(self, workspace: Workspace):
         """
         Retrieves a list of users from a specified Slack workspace.
 
         Args:
             workspace: The workspace from which to retrieve users.
-            next_cursor: The cursor for pagination of the Slack API results.
 
         Returns:
             A list of user objects from the workspace.
@@ -420,17 +564,22 @@ class SlackConnectionManager:
         Raises:
             Exception: If the API call to list users fails.
         """
-        await self._debounce("users_list", 20)
-        results = self._slack_user_client.users_list(
-            team_id=workspace.slack_id, limit=150, cursor=next_cursor
-        )
-        next_cursor = results.data["response_metadata"].get("next_cursor")
-
-        if next_cursor:
-            users = await self.get_users_of_workspace(workspace, next_cursor)
-            return results.data["members"] + users
+        members = []
+        next_cursor = None
+
+        while True:
+            await self._debounce("users_list", 20)
+            results = await asyncio.to_thread(
+                self._slack_user_client.users_list,
+                team_id=workspace.slack_id,
+                limit=150,
+                cursor=next_cursor,
+            )
+            members.extend(results.data["members"])
 
-        return results.data["members"]
+            next_cursor = results.data["response_metadata"].get("next_cursor")
+            if not next_cursor:
+                return members
 
     async def remove_user_from_workspace(self, user: User, workspace: Workspace):
         """
@@ -444,7 +593,8 @@ class SlackConnectionManager:
             Exception: If the user could not be removed from the workspace.
         """
         await self._debounce("admin_users_remove", 20)
-        self._slack_user_client.admin_users_remove(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_users_remove,
             team_id=workspace.slack_id,
             user_id=user.slack_id,
         )
@@ -460,27 +610,33 @@ class SlackConnectionManager:
             Exception: If the channel could not be made private.
         """
         await self._debounce("admin_conversations_convertToPrivate", 20)
-        self._slack_user_client.admin_conversations_convertToPrivate(
-            channel_id=channel.slack_id
+        await asyncio.to_thread(
+            self._slack_user_client.admin_conversations_convertToPrivate,
+            channel_id=channel.slack_id,
         )
 
     async def make_user_admin(self, user_id: str, workspace_id: str):
         await self._debounce("admin_users_setAdmin", 20)
-        self._slack_user_client.admin_users_setAdmin(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_users_setAdmin,
             team_id=workspace_id,
             user_id=user_id,
         )
 
     async def make_user_owner(self, user_id: str, workspace_id: str):
         await self._debounce("admin_users_setOwner", 20)
-        self._slack_user_client.admin_users_setOwner(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_users_setOwner,
             team_id=workspace_id,
             user_id=user_id,
         )
 
     async def update_user(self, user_data: ScimUser):
         await self._debounce("update_user", 20)
-        response = self._scim_client.update_user(user=user_data)
+        response = await asyncio.to_thread(
+            self._scim_client.update_user, user=user_data
+        )
+        self._forget_searched_user()
 
         if response.status_code != 200:
             raise ValueError(response.underlying.body["Errors"])
@@ -490,15 +646,20 @@ class SlackConnectionManager:
 
         partial_user = {"emails": [UserEmail(value=new_email, primary=True)]}
 
-        response = self._scim_client.patch_user(id=user_id, partial_user=partial_user)
+        response = await asyncio.to_thread(
+            self._scim_client.patch_user, id=user_id, partial_user=partial_user
+        )
+        self._forget_searched_user()
 
         if response.status_code != 200:
             raise ValueError(response.underlying.body["Errors"])
 
     async def update_photo(self, user_id: str, photo_url: str):
         await self._debounce("patch_user", 20)
-        response = self._scim_client.patch_user(
-            id=user_id, partial_user={"photos": [photo_url]}
+        response = await asyncio.to_thread(
+            self._scim_client.patch_user,
+            id=user_id,
+            partial_user={"photos": [photo_url]},
         )
 
         if response.status_code != 200:
@@ -506,9 +667,10 @@ class SlackConnectionManager:
 
     async def activate_user(self, user_id: str):
         await self._debounce("patch_user", 20)
-        response = self._scim_client.patch_user(
-            id=user_id, partial_user={"active": True}
+        response = await asyncio.to_thread(
+            self._scim_client.patch_user, id=user_id, partial_user={"active": True}
         )
+        self._forget_searched_user()
 
         if response.status_code != 200:
             raise ValueError(response.underlying.body["Errors"])
@@ -522,13 +684,15 @@ class SlackConnectionManager:
         resend_invitation_enabled: bool = False,
     ) -> str:
         await self._debounce("admin_users_invite", 20)
-        self._slack_user_client.admin_users_invite(
+        await asyncio.to_thread(
+            self._slack_user_client.admin_users_invite,
             team_id=team_id,
             email=user_email,
             channel_ids=channel_ids,
             email_password_policy_enabled=email_password_policy_enabled,
             resend=resend_invitation_enabled,
         )
+        self._forget_searched_user(user_email)
 
         created_user = await self.search_user(user_email)
 